@@ -3,10 +3,12 @@ Helper module for the plot scripts.
 """
 
 import itertools
+import operator
 import os
-import math
 
 import matplotlib as m
+import numpy as np
+from scipy.signal import lfilter
 
 # select matplotlib backend early
 if os.uname()[0] == "Darwin":
@@ -32,24 +34,30 @@ def read_list(fname, delim=","):
 def ewma(alpha, values):
     """
     Exponentially Weighted Moving Average.
+
+    Runs the recurrence prev = alpha*prev + (1-alpha)*v as an IIR filter
+    in C rather than a Python loop.  Accepts any sequence and returns an
+    np.ndarray.
     """
+    values = np.asarray(values, dtype=np.float64)
     if alpha == 0:
-        return list(values)
-    ret = []
-    prev = 0.0
-    for v in values:
-        prev = alpha * prev + (1 - alpha) * v
-        ret.append(prev)
-    return ret
+        return values.copy()
+    return lfilter([1.0 - alpha], [1.0, -alpha], values)
+
 
+def _identity(e):
+    return e
 
-def col(n, obj=None, clean=lambda e: e):
+
+def col(n, obj=None, clean=_identity):
     """
     A versatile column extractor.
 
     col(n)(item)         -> clean(item[n])
     col(n, row_list)     -> [clean(row[n]) for row in row_list]
     col(key, dict_obj)   -> clean(dict_obj.get(key))
+
+    For bulk ndarray data prefer direct column indexing (arr[:, n]).
     """
     if obj is None:
 
@@ -62,9 +70,12 @@ def col(n, obj=None, clean=lambda e: e):
         return clean(obj.get(n))
 
     if isinstance(obj, list):
-        # list of rows
+        # list of rows: one itemgetter instead of a closure call per row
         if obj and isinstance(obj[0], (list, dict)):
-            return [col(n, clean=clean)(item) for item in obj]
+            getter = operator.itemgetter(n)
+            if clean is _identity:
+                return list(map(getter, obj))
+            return [clean(v) for v in map(getter, obj)]
         # single flat list
         try:
             return clean(obj[n])
@@ -85,20 +96,27 @@ def avg(lst):
     """
     Average of a list of numbers or numeric strings.
     """
-    nums = [float(x) for x in lst]
-    return sum(nums) / len(nums) if nums else 0.0
+    arr = np.asarray(lst, dtype=np.float64)
+    return float(arr.mean()) if arr.size else 0.0
 
 
 def stdev(lst):
     """
     Standard deviation of a list of numbers.
     """
-    nums = [float(x) for x in lst]
-    if not nums:
-        return 0.0
-    mean = avg(nums)
-    var = sum((x - mean) ** 2 for x in nums) / len(nums)
-    return math.sqrt(var)
+    arr = np.asarray(lst, dtype=np.float64)
+    return float(arr.std()) if arr.size else 0.0
+
+
+def avg_std(lst):
+    """
+    Mean and sample standard deviation (ddof=1) in a single pass.
+    """
+    arr = np.asarray(lst, dtype=np.float64)
+    if arr.size == 0:
+        return 0.0, 0.0
+    std = float(arr.std(ddof=1)) if arr.size > 1 else 0.0
+    return float(arr.mean()), std
 
 
 def xaxis(values, limit):
@@ -120,68 +138,70 @@ def cdf(values):
     """
     Compute the empirical CDF of a list of numbers.
     """
-    sorted_vals = sorted(values)
-    l = len(sorted_vals)
-    x, y = [], []
-    for idx, v in enumerate(sorted_vals, start=1):
-        x.append(v)
-        y.append(idx / l)
-    return x, y
+    xs = np.sort(np.asarray(values, dtype=np.float64))
+    ys = np.arange(1, xs.size + 1) / xs.size
+    return xs, ys
 
 
-def parse_cpu_usage(fname, nprocessors=8):
-    """
-    Returns aggregated CPU usage tuples (user, system, nice, iowait, hirq, sirq, steal)
-    aggregated over all processors. DOES NOT RETURN IDLE times.
-    """
-    with open(fname, "r") as f:
-        lines = f.readlines()
+def _cpu_field(s):
+    """Strip the '%' suffix and any 'cpuN :' prefix from a usage field."""
+    return float(s.split("%")[0].split(":")[-1])
 
-    data_groups = grouper(nprocessors, lines)
-    ret = []
 
-    for group in data_groups:
-        totals = [0.0] * 8
-        for line in group:
-            if line is None:
-                continue
-            parts = line.split(":", 1)
-            if len(parts) < 2:
-                continue
-            usages = parts[1].split(",")
-            for i, usage in enumerate(usages):
-                num_str = usage.strip().split("%")[0]
-                try:
-                    totals[i] += float(num_str)
-                except ValueError:
-                    pass
-        # average over processors
-        averages = [t / nprocessors for t in totals]
-        # Skip idle time (index 3)
-        ret.append(averages[0:3] + averages[4:])
-    return ret
+def parse_cpu_usage(fname, nprocessors=8):
+    """
+    Returns aggregated CPU usage rows (user, system, nice, iowait, hirq, sirq, steal)
+    aggregated over all processors as an np.ndarray. DOES NOT RETURN IDLE times.
+    """
+    raw = np.loadtxt(
+        fname,
+        delimiter=",",
+        converters={i: _cpu_field for i in range(8)},
+        ndmin=2,
+    )
+    # Pad a trailing partial group with zeros; like the old line-loop,
+    # missing lines contribute nothing but we still divide by nprocessors.
+    ngroups = -(-raw.shape[0] // nprocessors)
+    padded = np.zeros((ngroups * nprocessors, 8))
+    padded[: raw.shape[0]] = raw
+    averages = padded.reshape(ngroups, nprocessors, 8).mean(axis=1)
+    # Skip idle time (index 3)
+    return np.delete(averages, 3, axis=1)
 
 
 def pc95(lst):
     """
     95th percentile.
     """
-    if not lst:
+    if len(lst) == 0:
         return None
-    sorted_lst = sorted(lst)
-    idx = int(0.95 * len(sorted_lst))
-    return sorted_lst[idx]
+    return float(np.percentile(lst, 95))
 
 
 def pc99(lst):
     """
     99th percentile.
     """
-    if not lst:
+    if len(lst) == 0:
         return None
-    sorted_lst = sorted(lst)
-    idx = int(0.99 * len(sorted_lst))
-    return sorted_lst[idx]
+    return float(np.percentile(lst, 99))
+
+
+def summarize(values):
+    """
+    Percentiles and CDF of a dataset in one shot, sharing a single sorted
+    buffer instead of re-sorting once per statistic.
+
+    Returns a dict with keys p95, p99, cdf_x, cdf_y.
+    """
+    xs = np.sort(np.ascontiguousarray(values, dtype=np.float64))
+    p95, p99 = np.percentile(xs, [95, 99])
+    return {
+        "p95": float(p95),
+        "p99": float(p99),
+        "cdf_x": xs,
+        "cdf_y": np.arange(1, xs.size + 1) / xs.size,
+    }
 
 
 def coeff_variation(lst):
@@ -1,8 +1,11 @@
 import http.server
-import socketserver
+from http.server import ThreadingHTTPServer
 
 
 class CSC458Handler(http.server.SimpleHTTPRequestHandler):
+    # Persistent connections; one thread per request via ThreadingHTTPServer
+    protocol_version = "HTTP/1.1"
+
     # Disable logging DNS lookups
     def address_string(self):
         return str(self.client_address[0])
@@ -11,6 +14,8 @@ class CSC458Handler(http.server.SimpleHTTPRequestHandler):
 PORT = 80
 
 Handler = CSC458Handler
-httpd = socketserver.TCPServer(("", PORT), Handler)
+httpd = ThreadingHTTPServer(("", PORT), Handler)
+# Don't let in-flight handler threads block shutdown
+httpd.daemon_threads = True
 print("Server1: httpd serving at port", PORT)
 httpd.serve_forever()
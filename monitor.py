@@ -1,29 +1,69 @@
-from time import sleep, time
+from time import sleep, time, monotonic
 from subprocess import *
+import os
 import re
 
+try:
+    from pyroute2 import IPRoute
+except ImportError:
+    IPRoute = None
+
 default_dir = "."
 
 
 def monitor_qlen(iface, interval_sec=0.01, fname="%s/qlen.txt" % default_dir):
-    pat_queued = re.compile(r"backlog\s[^\s]+\s([\d]+)p")
-    cmd = "tc -s qdisc show dev %s" % (iface)
-    ret = []
-    open(fname, "w").write("")
-    while 1:
-        p = Popen(cmd, shell=True, stdout=PIPE)
-        output = p.stdout.read()
-        output = output.decode("utf-8")
-
-        # Not quite right, but will do for now
-        matches = pat_queued.findall(output)
-        if matches and len(matches) > 1:
-            ret.append(matches[1])
-            t = "%f" % time()
-            open(fname, "a").write(t + "," + matches[1] + "\n")
-        sleep(interval_sec)
-    # open('qlen.txt', 'w').write('\n'.join(ret))
-    return
+    if IPRoute is None:
+        return _monitor_qlen_tc(iface, interval_sec, fname)
+
+    # Query the qdisc backlog over netlink: one RTT to the kernel per
+    # tick, no tc subprocess and no text parsing.
+    ipr = IPRoute()
+    idx = ipr.link_lookup(ifname=iface)[0]
+    # Hold one output fd for the whole run: a single os.write of raw bytes
+    # per sample instead of open/append/close through Python's buffered IO.
+    out_fd = os.open(fname, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    next_tick = monotonic()
+    try:
+        while 1:
+            qlens = []
+            for q in ipr.get_qdiscs(index=idx):
+                stats2 = q.get_attr("TCA_STATS2")
+                if stats2 is None:
+                    continue
+                queue = stats2.get_attr("TCA_STATS_QUEUE")
+                if queue is not None:
+                    qlens.append(queue["qlen"])
+
+            # Not quite right, but will do for now
+            if len(qlens) > 1:
+                os.write(out_fd, b"%f,%d\n" % (time(), qlens[1]))
+
+            # Sleep until the next tick, correcting for drift
+            next_tick += interval_sec
+            delay = next_tick - monotonic()
+            if delay > 0:
+                sleep(delay)
+    finally:
+        os.close(out_fd)
+        ipr.close()
+
+
+def _monitor_qlen_tc(iface, interval_sec, fname):
+    """Fallback qlen monitor that polls tc when pyroute2 is unavailable."""
+    pat_queued = re.compile(rb"backlog\s[^\s]+\s([\d]+)p")
+    cmd = ["tc", "-s", "qdisc", "show", "dev", iface]
+    out_fd = os.open(fname, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while 1:
+            output = check_output(cmd)
+
+            # Not quite right, but will do for now
+            matches = pat_queued.findall(output)
+            if matches and len(matches) > 1:
+                os.write(out_fd, b"%f,%s\n" % (time(), matches[1]))
+            sleep(interval_sec)
+    finally:
+        os.close(out_fd)
 
 
 def monitor_devs_ng(fname="%s/txrate.txt" % default_dir, interval_sec=0.01):
@@ -3,39 +3,40 @@ Plot ping RTTs over time
 """
 
 import argparse
+import re
 import sys
 
 import matplotlib as m
+import numpy as np
 from matplotlib.ticker import MaxNLocator
 from pylab import figure
 
-from helper import col
 import plot_defaults
 
+# Matches the "[sec.usec]" prefix (ping -D) and "time=XYZ" token of a reply.
+_TIME_RE = re.compile(rb"\[([\d.]+)\].*?time=([\d.]+)")
+
 
 def parse_ping(fname):
     """
     Parse ping output file for RTTs.
-    Returns list of [sequence_number, rtt_ms].
+    Returns (times, rtts) as np.ndarrays, with times in seconds relative
+    to the first reply.  Uses the real kernel timestamps that ping -D
+    prints rather than assuming a uniform probe interval.
     """
-    results = []
-    seq = 0
-    with open(fname, "r") as f:
-        for line in f:
-            if "bytes from" not in line:
-                continue
-            parts = line.strip().split()
-            # Expect format: ... time=XYZ ms
-            for token in parts:
-                if token.startswith("time="):
-                    try:
-                        rtt = float(token.split("=")[1])
-                        results.append([seq, rtt])
-                        seq += 1
-                    except ValueError:
-                        pass
-                    break
-    return results
+    with open(fname, "rb") as f:
+        data = f.read()
+    pairs = np.fromiter(
+        (
+            (float(m.group(1)), float(m.group(2)))
+            for m in _TIME_RE.finditer(data)
+        ),
+        dtype=np.dtype((np.float64, 2)),
+    )
+    if pairs.size == 0:
+        return np.empty(0), np.empty(0)
+    times = pairs[:, 0]
+    return times - times[0], pairs[:, 1]
 
 
 def main():
@@ -48,13 +49,6 @@ def main():
         nargs="+",
         dest="files",
     )
-    parser.add_argument(
-        "--freq",
-        help="Frequency of pings (per second)",
-        type=int,
-        default=10,
-        dest="freq",
-    )
     parser.add_argument(
         "--out",
         "-o",
@@ -70,18 +64,11 @@ def main():
     ax = fig.add_subplot(111)
 
     for fname in args.files:
-        data = parse_ping(fname)
-        if not data:
+        times, rtts = parse_ping(fname)
+        if rtts.size == 0:
             print(f"{sys.argv[0]}: error: no ping data in {fname}", file=sys.stderr)
             sys.exit(1)
 
-        xseq = [float(x) for x in col(0, data)]
-        # Normalize by frequency to get seconds
-        start = xseq[0]
-        times = [(x - start) / args.freq for x in xseq]
-
-        rtts = [float(y) for y in col(1, data)]
-
         ax.plot(times, rtts, lw=2, label=fname)
         ax.xaxis.set_major_locator(MaxNLocator(4))
 
@@ -8,222 +8,194 @@ of TCP congestion window behavior over time.
 
 import argparse
 import sys
-from collections import defaultdict
-from dataclasses import dataclass
-from typing import Dict, List, Tuple, DefaultDict, Optional
+from typing import List, Tuple
 
 import matplotlib as m
 import matplotlib.pyplot as plt
 import numpy as np
 
-from helper import col
 import plot_defaults
 
 
-@dataclass
-class TCPEvent:
-    """Class for storing TCP probe events with timestamp and cwnd information."""
-    timestamp: float
-    sport: int
-    cwnd: float
+# One packed record per probe event; replaces the per-event TCPEvent
+# dataclass (~100 B and a GC-tracked object each) with 24 B/event
+_EVT_DT = np.dtype([("ts", "f8"), ("sport", "i8"), ("cwnd", "f8")])
+
+# Matches the timestamp, ports and snd_cwnd of a tcp_probe ftrace line
+_PROBE_RE = (
+    r"(\d+\.\d+): tcp_probe: src=\S+?:(\d+) dest=\S+?:(\d+).*?snd_cwnd=(\d+)"
+)
+_PROBE_DT = np.dtype(
+    [("ts", "f8"), ("sport", "i8"), ("dport", "i8"), ("cwnd", "f8")]
+)
 
 
 def parse_tcp_probe_file(
-    fname: str, 
-    port: str, 
+    fname: str,
+    port: str,
     use_sport: bool
-) -> Tuple[DefaultDict[int, List[float]], DefaultDict[int, List[float]]]:
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Parse a tcp_probe ftrace output file, filtering by port.
-    
+
+    One C-level regex scan (np.fromregex) over the whole file replaces the
+    per-line split/dict parsing; lines that don't match are skipped.
+
     Args:
         fname: Path to the tcp_probe trace file
         port: Port number to filter on
         use_sport: If True, filter on source port; otherwise filter on dest port
-        
+
     Returns:
-        Tuple of (times, cwnd_vals) as defaultdicts keyed by source port
+        Tuple of (ts, sport, cwnd) parallel arrays, with cwnd in KB
     """
-    times = defaultdict(list)
-    cwnds = defaultdict(list)
-    
     MSS = 1480  # Maximum Segment Size in bytes
     KB = 1024.0  # Conversion factor to kilobytes
 
     try:
-        with open(fname, "r") as f:
-            for line in f:
-                if "tcp_probe:" not in line:
-                    continue
-
-                header, probe = line.strip().split("tcp_probe:", 1)
-                parts = header.split()
-
-                if len(parts) < 4:
-                    continue
-                    
-                try:
-                    timestamp = float(parts[-1].rstrip(":"))
-                except ValueError:
-                    continue
-
-                # Parse key=value fields
-                kv = {}
-                for token in probe.strip().split():
-                    if "=" in token:
-                        k, v = token.split("=", 1)
-                        kv[k] = v
-                
-                try:
-                    src_parts = kv.get("src", "").split(":")
-                    dst_parts = kv.get("dest", "").split(":")
-                    
-                    if len(src_parts) < 2 or len(dst_parts) < 2:
-                        continue
-                        
-                    sport = int(src_parts[1])
-                    dport = int(dst_parts[1])
-                except (IndexError, ValueError):
-                    continue
-
-                # Apply port filter
-                target_port = str(sport if use_sport else dport)
-                if target_port != port:
-                    continue
-
-                # Store valid data points
-                times[sport].append(timestamp)
-                try:
-                    # Convert cwnd to KB
-                    cwnd_raw = int(kv.get("snd_cwnd", 0))
-                    cwnd_kb = cwnd_raw * MSS / KB
-                    cwnds[sport].append(cwnd_kb)
-                except ValueError:
-                    continue
+        rec = np.fromregex(fname, _PROBE_RE, dtype=_PROBE_DT)
     except FileNotFoundError:
         print(f"Error: File {fname} not found", file=sys.stderr)
+        rec = np.empty(0, dtype=_PROBE_DT)
     except PermissionError:
         print(f"Error: No permission to read {fname}", file=sys.stderr)
-                
-    return times, cwnds
+        rec = np.empty(0, dtype=_PROBE_DT)
+
+    # Apply port filter
+    mask = rec["sport" if use_sport else "dport"] == int(port)
+    rec = rec[mask]
+
+    # Convert cwnd to KB
+    return rec["ts"], rec["sport"], rec["cwnd"] * (MSS / KB)
 
 
 def plot_cwnd_timeseries(
-    ax: plt.Axes, 
-    files: List[str], 
-    port: str, 
+    ax: plt.Axes,
+    files: List[str],
+    port: str,
     use_sport: bool
-) -> List[TCPEvent]:
+) -> np.ndarray:
     """
     Plot per-port cwnd traces on the provided axes.
-    
+
     Args:
         ax: Matplotlib axes to plot on
         files: List of tcp_probe trace files
         port: Port number to filter on
         use_sport: If True, filter on source port; otherwise filter on dest port
-        
+
     Returns:
-        List of TCPEvent objects sorted by timestamp
+        Structured event array (_EVT_DT), time-normalized and sorted by
+        timestamp; feed it to calculate_total_cwnd
     """
-    all_events = []
-    all_timestamps = []
     collected_data = []
-    
+
     # First pass: collect all timestamps and data
     for fname in files:
-        time_dict, cwnd_dict = parse_tcp_probe_file(fname, port, use_sport)
-        
-        for sport in sorted(cwnd_dict):
-            timestamps = time_dict[sport]
-            cwnd_values = cwnd_dict[sport]
-            
-            # Skip empty data sets
-            if not timestamps:
-                continue
-                
-            all_timestamps.extend(timestamps)
-            collected_data.append((sport, timestamps, cwnd_values))
-    
+        ts_f, sport_f, cwnd_f = parse_tcp_probe_file(fname, port, use_sport)
+
+        for sport in np.unique(sport_f):
+            sel = sport_f == sport
+            collected_data.append((int(sport), ts_f[sel], cwnd_f[sel]))
+
     # Find global start time
-    if not all_timestamps:
-        return []  # No data found
-        
-    global_start_time = min(all_timestamps)
-    
+    if not collected_data:
+        return np.empty(0, dtype=_EVT_DT)  # No data found
+
+    global_start_time = min(timestamps.min() for _, timestamps, _ in collected_data)
+
     # Second pass: normalize against global start time and plot
+    ts_parts = []
+    sport_parts = []
+    cwnd_parts = []
     for sport, timestamps, cwnd_values in collected_data:
         # Normalize timestamps globally
-        rel_timestamps = [t - global_start_time for t in timestamps]
-        
-        # Create events for later total cwnd calculation
-        events = [TCPEvent(t, sport, cw) for t, cw in zip(rel_timestamps, cwnd_values)]
-        all_events.extend(events)
-        
+        rel_timestamps = timestamps - global_start_time
+
+        # Accumulate parallel arrays for the total cwnd calculation
+        ts_parts.append(rel_timestamps)
+        sport_parts.append(np.full(rel_timestamps.size, sport, dtype=np.int64))
+        cwnd_parts.append(cwnd_values)
+
         # Plot individual port's cwnd
         ax.plot(rel_timestamps, cwnd_values, label=f"port {sport}")
-    
+
+    events = np.empty(sum(t.size for t in ts_parts), dtype=_EVT_DT)
+    events["ts"] = np.concatenate(ts_parts)
+    events["sport"] = np.concatenate(sport_parts)
+    events["cwnd"] = np.concatenate(cwnd_parts)
+
     # Sort events chronologically
-    all_events.sort(key=lambda e: e.timestamp)
-    return all_events
+    events.sort(order="ts", kind="stable")
+    return events
 
 
-def calculate_total_cwnd(events: List[TCPEvent]) -> Tuple[List[float], List[float]]:
+def calculate_total_cwnd(events: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     """
     Calculate the total cwnd across all ports at each timestamp.
-    
+
+    Each event replaces its port's latest cwnd contribution, so the total
+    at each step is the running sum of per-event deltas.  All deltas are
+    computed with array ops; no per-event Python loop.
+
     Args:
-        events: List of TCPEvent objects sorted by timestamp
-        
+        events: Structured event array (_EVT_DT) sorted by timestamp
+
     Returns:
         Tuple of (timestamps, total_cwnd_values)
     """
-    if not events:
-        return [], []
-        
-    total_cwnd = 0.0
-    latest_cwnd_by_port = {}
-    timestamps = []
-    total_values = []
-    
-    for event in events:
-        # Subtract old cwnd value for this port (if any)
-        if event.sport in latest_cwnd_by_port:
-            total_cwnd -= latest_cwnd_by_port[event.sport]
-            
-        # Add new cwnd value
-        total_cwnd += event.cwnd
-        latest_cwnd_by_port[event.sport] = event.cwnd
-        
-        # Record the timestamp and new total
-        timestamps.append(event.timestamp)
-        total_values.append(total_cwnd)
-        
-    return timestamps, total_values
+    if events.size == 0:
+        return np.empty(0), np.empty(0)
 
+    sport = events["sport"]
+    cwnd = events["cwnd"]
 
-def plot_cwnd_histogram(ax: plt.Axes, total_cwnd_values: List[float]) -> None:
+    # Group events by port while preserving time order within each group,
+    # then shift each group down by one to get the previous cwnd per port.
+    grp = np.lexsort((np.arange(events.size), sport))
+    cwnd_grouped = cwnd[grp]
+    prev_grouped = np.empty_like(cwnd_grouped)
+    prev_grouped[0] = 0.0
+    prev_grouped[1:] = cwnd_grouped[:-1]
+    # A port's first event has no predecessor to subtract
+    first_in_group = np.empty(grp.size, dtype=bool)
+    first_in_group[0] = True
+    first_in_group[1:] = sport[grp][1:] != sport[grp][:-1]
+    prev_grouped[first_in_group] = 0.0
+
+    # Scatter the per-port previous values back to chronological order
+    prev = np.empty_like(cwnd)
+    prev[grp] = prev_grouped
+
+    total_values = np.cumsum(cwnd - prev)
+    return events["ts"], total_values
+
+
+def plot_cwnd_histogram(ax: plt.Axes, total_cwnd_values: np.ndarray) -> None:
     """Plot histogram of total cwnd values."""
-    if not total_cwnd_values:
+    if total_cwnd_values.size == 0:
         ax.text(0.5, 0.5, "No data to display", 
                 ha='center', va='center', transform=ax.transAxes)
         return
         
-    ax.hist(total_cwnd_values, bins=50, density=True, alpha=0.75)
+    # Bin on the ndarray directly and draw bars; avoids ax.hist's internal
+    # list-to-array conversion pass on large traces
+    counts, edges = np.histogram(total_cwnd_values, bins=50, density=True)
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', alpha=0.75)
     ax.set_xlabel("cwnd sum (KB)")
     ax.set_ylabel("Density")
     ax.set_title("Histogram of total cwnd")
-    
-    # Add mean and median lines
-    mean_val = np.mean(total_cwnd_values)
+
+    # Add mean and median lines, each computed once
+    mean_val = total_cwnd_values.mean()
     median_val = np.median(total_cwnd_values)
-    
+
     # Plot vertical lines for mean and median
-    ax.axvline(mean_val, color='r', linestyle='-', linewidth=1, 
+    ax.axvline(mean_val, color='r', linestyle='-', linewidth=1,
                label=f'Mean: {mean_val:.2f}')
-    ax.axvline(median_val, color='g', linestyle='--', linewidth=1, 
+    ax.axvline(median_val, color='g', linestyle='--', linewidth=1,
                label=f'Median: {median_val:.2f}')
-    
+
     ax.legend()
 
 
@@ -274,10 +246,10 @@ def main():
     
     # Plot cwnd timeseries with global time normalization
     events = plot_cwnd_timeseries(ax_timeseries, args.files, args.port, args.sport)
-    
-    if not events:
+
+    if events.size == 0:
         print("No matching TCP events found in the provided files.", file=sys.stderr)
-        ax_timeseries.text(0.5, 0.5, "No data to display", 
+        ax_timeseries.text(0.5, 0.5, "No data to display",
                           ha='center', va='center', transform=ax_timeseries.transAxes)
     else:
         # Calculate and plot total cwnd
@@ -15,5 +15,5 @@ rm -rf __pycache__/
 
 pgrep -f webserver.py | xargs kill -9 2>/dev/null || true
 pgrep -f iperf | xargs kill -9 2>/dev/null || true
-pgrep -f 'cat /sys/kernel/debug/tracing/trace_pipe' | xargs kill -9 2>/dev/null || true
+pgrep -f tracepipe_splicer.py | xargs kill -9 2>/dev/null || true
 echo 0 > /sys/kernel/debug/tracing/events/tcp/tcp_probe/enable
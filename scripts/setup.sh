@@ -1,3 +1,3 @@
 #!/bin/bash
 
-sudo pip3 install termcolor matplotlib numpy
+sudo pip3 install termcolor matplotlib numpy scipy pyroute2
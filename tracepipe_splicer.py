@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Copy the ftrace trace_pipe into a file in-kernel via splice(2).
+
+Replaces "cat trace_pipe > file", which moves every byte into user space
+and back out again.  splice shuffles pages inside the kernel (ftrace
+implements splice_read for trace_pipe), so the reader adds no user-space
+copies to the experiment it is measuring.
+
+Usage: tracepipe_splicer.py OUTFILE [SRC]
+"""
+
+import errno
+import os
+import sys
+
+TRACE_PIPE = "/sys/kernel/debug/tracing/trace_pipe"
+CHUNK = 64 * 1024
+_SPLICE_F_MOVE = 1
+
+if hasattr(os, "splice"):
+
+    def _splice(src, dst, count):
+        return os.splice(src, dst, count, flags=_SPLICE_F_MOVE)
+
+else:
+    # Python < 3.10: call libc directly
+    import ctypes
+
+    _libc = ctypes.CDLL(None, use_errno=True)
+
+    def _splice(src, dst, count):
+        n = _libc.splice(src, None, dst, None, count, _SPLICE_F_MOVE)
+        if n < 0:
+            e = ctypes.get_errno()
+            raise OSError(e, os.strerror(e))
+        return n
+
+
+def pump_splice(src, dst):
+    """Move src -> dst through an intermediate pipe, fully in-kernel."""
+    pr, pw = os.pipe()
+    try:
+        while True:
+            n = _splice(src, pw, CHUNK)
+            if n == 0:
+                return
+            while n:
+                n -= _splice(pr, dst, n)
+    finally:
+        os.close(pr)
+        os.close(pw)
+
+
+def pump_readwrite(src, dst):
+    """Plain read/write fallback for sources that refuse splice."""
+    while True:
+        buf = os.read(src, CHUNK)
+        if not buf:
+            return
+        os.write(dst, buf)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(f"usage: {sys.argv[0]} OUTFILE [SRC]", file=sys.stderr)
+        sys.exit(1)
+    src_path = sys.argv[2] if len(sys.argv) > 2 else TRACE_PIPE
+
+    src = os.open(src_path, os.O_RDONLY)
+    dst = os.open(sys.argv[1], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        try:
+            pump_splice(src, dst)
+        except OSError as e:
+            if e.errno != errno.EINVAL:
+                raise
+            pump_readwrite(src, dst)
+    finally:
+        os.close(src)
+        os.close(dst)
+
+
+if __name__ == "__main__":
+    main()